@@ -2,6 +2,7 @@ print('imported cvtools')
 
 # from .color_picker import color_picker_hsv
 
+import os
 import numpy as np
 
 # from ._imread.nd2 import imread_nd2, MetadataND2
@@ -32,18 +33,19 @@ def imread_nd2(filepath):
 
 
 
+_IMREAD_DISPATCH = {
+    'nd2': imread_nd2,
+    'tif': imread_tif,
+}
+
 def imread(filepath: str, *args, **kwargs) -> np.ndarray:
     """
     """
-    if not '.' in filepath: raise ValueError(f"missing extension in filename: {filepath}")
-    
-    ext = filepath.split('.')[-1]
+    ext = os.path.splitext(filepath)[1][1:].lower()
+    if not ext: raise ValueError(f"missing extension in filename: {filepath}")
     
     # allow reading various data formats
-    read_function = {
-        'nd2': imread_nd2,
-        'tif': imread_tif,
-    }.get(ext)
+    read_function = _IMREAD_DISPATCH.get(ext)
     
     if not read_function:
         raise NotImplementedError(f'Cannot read image of type {ext}')
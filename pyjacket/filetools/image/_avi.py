@@ -1,6 +1,7 @@
 import cv2
 import numpy as np
 import pims
+from .models import ImageReader
 
 # def read(filepath):
 #     cap = cv2.VideoCapture(filepath)
@@ -15,9 +16,23 @@ import pims
 #         result[i] = frame
 #     return result
 
-def read(filepath):
+def read(filepath, out: np.ndarray=None):
     print('reading img data, this can take a while...')
-    return np.array(pims.open(filepath))
+    frames = pims.open(filepath)
+    if out is None:
+        out = np.empty((len(frames), *frames.frame_shape), dtype=frames.pixel_type)
+    for i, frame in enumerate(frames):
+        out[i] = frame
+    return out
+
+
+class AviReader(ImageReader):
+
+    def read(self, file_path: str, out: np.ndarray=None, **kwargs) -> np.ndarray:
+        return read(file_path, out=out)
+
+    def write(self, file_path: str, data: np.ndarray, meta=None, **kwargs):
+        return write(file_path, data, **kwargs)
 
 # def read_frame(cap, idx):
 #     cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
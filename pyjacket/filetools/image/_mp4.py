@@ -5,10 +5,62 @@ import cv2
 from typing import Union
 
 from pyjacket import arrtools
+from .models import ImageReader
 # from pyjacket.filetools.image._image import ImageHandle
 
-def read(filepath):
-    ...
+def read(filepath, out: np.ndarray=None):
+    """Read all frames into one (t, y, x, ch) array.
+    Frames are decoded straight into `out` (or a new buffer), without per-frame copies."""
+    cap = cv2.VideoCapture(filepath)
+    if not cap.isOpened():
+        raise OSError(f"Cannot open video: {filepath}")
+
+    try:
+        t = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        y = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        x = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        own_out = out is None
+        if own_out:
+            out = np.empty((t, y, x, 3), dtype=np.uint8)
+
+        # OpenCV only decodes in place into matching buffers, else it silently allocates
+        elif out.dtype != np.uint8 or out.shape[1:] != (y, x, 3) or not out.flags.c_contiguous:
+            raise ValueError(f"out must be a C-contiguous uint8 array of shape (t, {y}, {x}, 3), "
+                             f"got {out.dtype} array of shape {out.shape}")
+
+        n = 0
+        while n < len(out):
+            ret, _ = cap.read(out[n])
+            if not ret:  break
+            n += 1
+        else:
+            # The frame count in the header is an estimate and can be too low
+            if not own_out:
+                if cap.grab():
+                    raise ValueError(f"out has room for {len(out)} frames, but the video has more")
+                return out
+            extra = []
+            while True:
+                ret, frame = cap.read()
+                if not ret:  break
+                extra.append(frame)
+            if extra:
+                out = np.concatenate([out, np.stack(extra)])
+            return out
+    finally:
+        cap.release()
+
+    # The count can also be too high
+    return out[:n]
+
+
+class Mp4Reader(ImageReader):
+
+    def read(self, file_path: str, out: np.ndarray=None, **kwargs) -> np.ndarray:
+        return read(file_path, out=out)
+
+    def write(self, file_path: str, data: np.ndarray, meta=None, **kwargs):
+        return write(file_path, data, meta, **kwargs)
 
 def write(filepath, data: np.ndarray, meta=None, frame_time=1/10, max_fps=60, scale=None):
     """Data needs to be 3d array of shape (frames, height, width)"""
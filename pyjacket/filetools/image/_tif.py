@@ -1,136 +1,195 @@
 import tifffile
 import numpy as np
-from .models import ImageHandle, Metadata, ImageReader, ExifTag
+from functools import cached_property
+from .models import ImageHandle, Metadata, ImageReader, ExifTag, _is_full
 
-def get_axes(file_path):
-    with tifffile.TiffFile(file_path) as tif:
-        axes = tif.series[0].axes
-    return axes
+TAGS = tifffile.TIFF.TAGS  # {code: name} of all known tif tags
 
 class TifMetadata(Metadata):
 
     def __init__(self, filename):
         self.filename = filename
         self._exif = self.read_exif(filename)
+        self._exif_values = {i: t.value for i, t in self._exif.items()}
     
     def read_exif(self, file_path)  -> dict[int, ExifTag]:
-        tif = tifffile.TiffFile(file_path)
-        exif = tif.pages[0].tags
+        with tifffile.TiffFile(file_path) as tif:
+            exif = tif.pages[0].tags
         return exif
 
     def exif_value(self, i: int, default=None):
-        x = self._exif.get(i)
-        x = x.value if x is not None else default
-        return x
+        return self._exif_values.get(i, default)
 
-    # @property
-    # def shape(self):
-    #     x = self.exif_value(256) # tuple or None
-    #     y = self.exif_value(257) # tuple or None
-    #     return (y, x)
+    # EXIF does not change after loading, so parse each property only once
+    @cached_property
+    def shape(self):
+        x = self.exif_value(256) # int or None
+        y = self.exif_value(257) # int or None
+        return (y, x)
 
-
-    @property
+    @cached_property
     def bits(self):
         return self.exif_value(258)
 
-    # @property
-    # def resolution(self):  # 282 and 283
-    #     x = self.exif_value(282) # tuple or None
-    #     y = self.exif_value(283) # tuple or None
-    #     x = float(Fraction(*x)) if x else 1
-    #     y = float(Fraction(*y)) if y else 1
-    #     return (y, x)
+    @cached_property
+    def resolution(self):  # 282 and 283
+        x = self.exif_value(282) # tuple or None
+        y = self.exif_value(283) # tuple or None
+        x = x[0] / x[1] if x and x[1] else 1.0
+        y = y[0] / y[1] if y and y[1] else 1.0
+        return (y, x)
 
-    # @property
-    # def resolution_unit(self):  # 296
-    #     return self.exif_value(296) # tuple or None
+    @cached_property
+    def resolution_unit(self):  # 296
+        return self.exif_value(296) # int or None
 
-    # @property
-    # def dict(self):
-    #     return {t.name: t.value for i, t in self._exif.items() if i in TAGS}
+    @cached_property
+    def dict(self):
+        return {name: v for i, v in self._exif_values.items() if (name := TAGS.get(i)) is not None}
 
     def __repr__(self):
-        return f"Metadata({dir(self)})"
+        return f"Metadata({self.filename!r})"
 
 
 class TifImageHandle(ImageHandle):
     """Read image data from a tif file"""
     
     data: tifffile.TiffPage
+    prefetch = 4  # decoded reads are serialised by the file handle lock
     
     def open(self):
         self.file = tifffile.TiffFile(self.file_path)
+        self.file.filehandle.set_lock(True)  # shared by copies and the prefetch thread
         data = self.file.series[0]  # TiffPage
+
+        # Uncompressed, contiguous stacks can be memory-mapped:
+        # frames become views into the file instead of decoded copies
+        self.mmap = None
+        if data.axes in ('ZYX', 'ZYXS', 'ZCYX', 'TCYX'):
+            try:
+                self.mmap = tifffile.memmap(self.file_path, mode='c')  # copy-on-write
+            except ValueError:
+                pass  # compressed or tiled, decode page by page
+
+        # Memory-mapped frames are views without any I/O, nothing to prefetch
+        if self.mmap is not None:
+            self.prefetch = 0
         return data  
     
     def close(self):
+        self.mmap = None
         self.file.close()
     
     def get(self, i):
         """Go to the desired frame number. O(1)"""
-        N = self.shape[0]
-        if not (-N < i <= N):
+        N = self.max_shape[0]
+        if not (-N <= i < N):
             raise IndexError("Frame index out of range")
+        if i < 0:
+            i += N
+
+        # Number of pages (channels) that make up one frame
+        n = self.pages_per_frame
+
+        # Memory-mapped data: return a (copy-on-write) view, no decoding
+        if self.mmap is not None:
+            if self.unzip > 1:
+                return np.moveaxis(self.mmap[i*n:(i+1)*n], 0, -1)
+            elif self.transpose:
+                return self.mmap[i].transpose(1, 2, 0)
+            return self.mmap[i]
+
+        # Unzipped or (ch, y, x) frames: decode all channel pages in one call
+        # into a contiguous (ch, y, x) buffer and return a (y, x, ch) view
+        if n > 1:
+            stack = np.empty((n, *self.max_shape[1:3]), dtype=self.data.dtype)
+            self.data.asarray(key=slice(i*n, (i+1)*n), out=stack)
+            return np.moveaxis(stack, 0, -1)
+
+        return self.data.asarray(key=i)
+
+    def _read_slab(self, i, spatial_slices):
+        """Decode only the tiles/strips of frame i that intersect spatial_slices"""
+        if self.mmap is not None or self.unzip > 1 or self.data.axes != 'ZYX':
+            return super()._read_slab(i, spatial_slices)
+        if all(_is_full(s) for s in spatial_slices):
+            return self.get(i)
+
+        page = self.data[i]  # TiffPage or TiffFrame
+        keyframe = page.keyframe
+        if keyframe.planarconfig != 1 or keyframe.imagedepth > 1 or keyframe.jpegtables is not None:
+            return super()._read_slab(i, spatial_slices)
+
+        height, width = keyframe.imagelength, keyframe.imagewidth
+        rows = range(*spatial_slices[0].indices(height))
+        cols = range(*spatial_slices[1].indices(width))
+        if not rows or not cols:
+            return super()._read_slab(i, spatial_slices)
+
+        # Bounding box of the requested pixels
+        y0, y1 = min(rows[0], rows[-1]), max(rows[0], rows[-1]) + 1
+        x0, x1 = min(cols[0], cols[-1]), max(cols[0], cols[-1]) + 1
+
+        # Segments are tiles, or strips spanning the full image width
+        if keyframe.is_tiled:
+            seg_h, seg_w = keyframe.tilelength, keyframe.tilewidth
+        else:
+            seg_h, seg_w = min(keyframe.rowsperstrip, height), width
+        seg_cols = -(-width // seg_w)
+        indices = [r * seg_cols + c
+                   for r in range(y0 // seg_h, (y1 - 1) // seg_h + 1)
+                   for c in range(x0 // seg_w, (x1 - 1) // seg_w + 1)]
+
+        box = np.zeros((y1 - y0, x1 - x0, keyframe.samplesperpixel), dtype=self.data.dtype)
+        segments = self.file.filehandle.read_segments(
+            [page.dataoffsets[j] for j in indices],
+            [page.databytecounts[j] for j in indices],
+            indices=indices,
+        )
+        for data, j in segments:
+            # Edge tiles may come back padded; only the overlap is copied below
+            segment, (_, _, y, x, _), _ = keyframe.decode(data, j)
+            if segment is None:
+                continue  # empty segment, stays zero
+            segment = segment[0]
+            ys, ye = max(y, y0), min(y + segment.shape[0], y1)
+            xs, xe = max(x, x0), min(x + segment.shape[1], x1)
+            box[ys-y0:ye-y0, xs-x0:xe-x0] = segment[ys-y:ye-y, xs-x:xe-x]
+        box = box.reshape(box.shape[:2] + keyframe.shape[2:])
+
+        # Crop the bounding box with the original step sizes
+        def local(r: range, lo: int):
+            stop = r.stop - lo
+            return slice(r.start - lo, stop if stop >= 0 else None, r.step)
+        return box[(local(rows, y0), local(cols, x0), *spatial_slices[2:])]
+
+    def read_all(self):
+        """Load all image data in a single read. Memory-mapped data is returned as a copy-on-write view"""
+        if self.operator or self.unzip > 1 or not all(_is_full(s) for s in self.slices):
+            return super().read_all()
+
+        data = self.mmap if self.mmap is not None else self.data.asarray()
+        if self.transpose:
+            data = np.moveaxis(data, 1, -1)
+        return data
 
-        i *= self.unzip
-        frame: np.ndarray = self.data.asarray(key=i) 
-
-        # Unzipping the data
-        if self.unzip > 1:
-            stack = np.empty((*frame.shape, self.unzip), dtype=frame.dtype)
-            stack[..., 0] = frame
-            for di in range(1, self.unzip):
-                stack[..., di] = self.data.asarray(key=i+di) 
-            frame = stack
-        
-        elif self.ndim == 4:
-
-            # In case we need to transpose the axes
-            # the indices might be different
-            # reshuffle
-            axes = get_axes(self.file_path)
-            # print(f"{axes = }")
-            if axes in ('ZCYX', 'TCYX'):
-                self.data.asarray(key=i)
-
-                num_channels = self.shape[-1]
-                i *= num_channels
-                stack = [self.data.asarray(key=i+di) for di in range(num_channels)]
-                frame = np.stack(stack, axis=-1)
-
-            # i *= num_channels
-
-            else:
-                raise ValueError(f'Unsupported axes format: {axes = }')
-
-
-            # # 4d data is really stored in a 3d format for some reason
-            # # So we need to unzip the channels
-            # num_channels = self.shape[3]
-            # i *= num_channels
-            
-            # # stack all of the color channels
-            # stack = [self.data.asarray(key=i+di) for di in range(num_channels)]
-            # frame = np.stack(stack, axis=-1)
-
-        return frame
-    
     def get_max_shape(self):
         
 
         # In case of transposing axes
         # Decide whether we need to transpose
-        axes = get_axes(self.file_path)
+        axes = self.data.axes
         # print(f"{axes = }")
         if axes in ('ZCYX', 'TCYX'):
             t, ch, y, x = self.data.shape
             max_shape = (t, y, x, ch)
             self.transpose = (0, 2, 3, 1)
+            self.pages_per_frame = ch
 
         elif axes in ('YXS', 'ZYX', 'ZYXS', 'YX'):
             max_shape = self.data.shape
             self.transpose = False
+            self.pages_per_frame = 1
 
         else:
             raise ValueError(f'Unsupported axes format: {axes = }')
@@ -142,33 +201,72 @@ class TifImageHandle(ImageHandle):
             assert len(max_shape) == 3, ValueError(f'Can only unzip 3D data, got {len(max_shape)}')
             t, y, x = max_shape
             max_shape = (t//ch, y, x, ch)
+            self.pages_per_frame = ch
             
         return max_shape
 
 
+def _asarray(tif: tifffile.TiffFile, out: np.ndarray=None, **kwargs) -> np.ndarray:
+    """Decode series 0 into out. tifffile can only fill C-contiguous arrays"""
+    if out is None:
+        return tif.asarray(series=0, **kwargs)
+    if out.flags.c_contiguous:
+        tif.asarray(series=0, out=out.view(), **kwargs)  # tifffile reshapes the view, not out
+    else:
+        out[...] = tif.asarray(series=0, **kwargs)
+    return out
+
+
 class TifReader(ImageReader):
 
-    def read(self, file_path: str, **kwargs) -> np.ndarray:
-        data = tifffile.imread(file_path)
-        
-        # Decide whether to transpose based on the meta data
-        transpose = False
-        axes = get_axes(file_path)
-        print(f"{axes = }")
+    def read(self, file_path: str, channel: int=None, out: np.ndarray=None, **kwargs) -> np.ndarray:
+        """Read all image data, optionally only one channel.
+        Pass a preallocated `out` array to decode into it without extra copies."""
+        with tifffile.TiffFile(file_path) as tif:
+            series = tif.series[0]
 
-        transpose = False
-        if axes in ('ZCYX', 'TCYX'):
-            transpose = True
-        elif axes in ('YXS', 'ZYX', 'ZYXS', 'YX'):
-            transpose = False
-        else:
-            raise ValueError(f'new axes format: {axes = }')
-        
-        # Ensure channels are in last dimension
-        if transpose and data.ndim == 4:
-            data = np.transpose(data, (0, 2, 3, 1))
+            # Decide whether to transpose based on the meta data
+            axes = series.axes
+            print(f"{axes = }")
 
-        return data
+            transpose = False
+            if axes in ('ZCYX', 'TCYX'):
+                transpose = True
+            elif axes in ('YXS', 'ZYX', 'ZYXS', 'YX'):
+                transpose = False
+            else:
+                raise ValueError(f'new axes format: {axes = }')
+
+            if transpose and channel is not None:
+                # Only decode the pages that hold this channel
+                num_channels = series.shape[1]
+                if not (-num_channels <= channel < num_channels):
+                    raise IndexError(f"Channel {channel} out of range for {num_channels} channels")
+                channel %= num_channels
+                pages = list(range(channel, len(series), num_channels))
+                return _asarray(tif, out, key=pages)
+
+            elif transpose and out is not None:
+                # Decode (ch, y, x) frames one at a time into the (y, x, ch) slots of out
+                num_channels = series.shape[1]
+                frame = np.empty(series.shape[1:], dtype=series.dtype)
+                for t in range(series.shape[0]):
+                    tif.asarray(key=slice(t*num_channels, (t+1)*num_channels), series=0, out=frame)
+                    out[t] = np.moveaxis(frame, 0, -1)
+                return out
+
+            elif transpose:
+                # Ensure channels are in last dimension (a view)
+                return np.moveaxis(tif.asarray(series=0), 1, -1)
+
+            elif channel is not None and axes in ('YXS', 'ZYXS'):
+                data = tif.asarray(series=0)[..., channel]
+                if out is None:
+                    return data
+                out[...] = data
+                return out
+
+            return _asarray(tif, out)
 
     def read_lazy(self, file_path: str, **kwargs) -> TifImageHandle:
         return TifImageHandle(file_path, **kwargs)
@@ -205,4 +303,24 @@ class TifReader(ImageReader):
         return tifffile.imwrite(file_path, data, **kwargs)
 
     def write_lazy(self, file_path: str, data: ImageHandle, meta:Metadata=None, **kwargs):
-        return self.write(file_path, data, meta=None, **kwargs)
\ No newline at end of file
+        """Stream frames to file without loading the whole stack in memory"""
+        # A whole memory-mapped stack is written straight from the file
+        if getattr(data, 'mmap', None) is not None and data.operator is None \
+                and all(_is_full(s) for s in data.slices):
+            return self.write(file_path, data.read_all(), meta=None, **kwargs)
+
+        if data.ndim not in [3, 4]:
+            raise ValueError(f'Cannot lazy-write .tif with {data.ndim} dimensions')
+
+        elif data.ndim == 3:  # (t, y, x)
+            shape = data.shape
+            planes = iter(data)
+        elif data.ndim == 4:  # (t, y, x, ch)
+            # Stored as (t, ch, y, x), i.e. one page per channel
+            t, y, x, ch = data.shape
+            shape = (t, ch, y, x)
+            planes = (frame[..., c] for frame in data for c in range(ch))
+
+        # tifffile consumes the generator page by page into one contiguous series
+        kwargs.setdefault('imagej', True)
+        return tifffile.imwrite(file_path, planes, shape=shape, dtype=data.dtype, **kwargs)
\ No newline at end of file
@@ -25,6 +25,8 @@ class FileType:
 
 SUPPORTED: dict[str, FileType] = {
     'tif': _tif.TifReader(),
+    'mp4': _mp4.Mp4Reader(),
+    'avi': _avi.AviReader(),
 }
 
 def read_img(file_path: str, lazy=False, **kwargs):
@@ -91,6 +93,7 @@ def read_img(file_path: str, lazy=False, **kwargs):
     Args:
         filepath (str): Location of the image file
         lazy (bool, optional): Read lazy to save memory. Defaults to False.
+        **kwargs: Passed to the reader, e.g. channel or a preallocated out array (tif).
 
     Raises:
         ValueError: _description_
@@ -107,9 +110,9 @@ def read_img(file_path: str, lazy=False, **kwargs):
     pth = next(iter_dir(file_path)) if img_seq else file_path
     file_type = _get_extension(pth)  ##os.path.splitext(pth)[1].lstrip('.')
     assert file_type, ValueError('File ext not found in path')
-    assert file_type in SUPPORTED, NotImplementedError(f"Unsupported file type: '{file_type}'")
 
-    lib = SUPPORTED[file_type]  # reader lib for this file type
+    lib = SUPPORTED.get(file_type)  # reader lib for this file type
+    assert lib, NotImplementedError(f"Unsupported file type: '{file_type}'")
     if img_seq:
         if lazy:  return lib.seq_read_lazy(file_path, **kwargs)
         else:     return lib.seq_read(     file_path, **kwargs)
@@ -120,9 +123,9 @@ def read_img(file_path: str, lazy=False, **kwargs):
 def read_img_meta(file_path: str, **kwargs):
     file_type = _get_extension(file_path)
     assert file_type, ValueError('File ext not found in path')
-    assert file_type in SUPPORTED, NotImplementedError(f"Unsupported file extension: '{file_type}'")
 
-    lib = SUPPORTED[file_type]  # reader lib for this file type
+    lib = SUPPORTED.get(file_type)  # reader lib for this file type
+    assert lib, NotImplementedError(f"Unsupported file extension: '{file_type}'")
     return lib.read_meta(file_path, **kwargs)
 
 def write_img(file_path: str, data: Union[np.ndarray, ImageHandle], meta: Metadata=None, **kwargs):
@@ -131,13 +134,13 @@ def write_img(file_path: str, data: Union[np.ndarray, ImageHandle], meta: Metada
 
     file_type = _get_extension(file_path)
     assert file_type, ValueError('File ext not found in path')
-    assert file_type in SUPPORTED, NotImplementedError(f"Unsupported file type: '{file_type}'")
-    
-    lib = SUPPORTED[file_type]  # reader lib for this file type
+
+    lib = SUPPORTED.get(file_type)  # reader lib for this file type
+    assert lib, NotImplementedError(f"Unsupported file type: '{file_type}'")
     return lib.write(file_path, data, meta, **kwargs)
 
 def _get_extension(file_path: str):
-    ext = os.path.splitext(file_path)[1].lstrip('.')
+    ext = os.path.splitext(file_path)[1][1:].lower()
     return ext
 
 ...
\ No newline at end of file
@@ -1,8 +1,20 @@
 import os
+import queue
+import threading
 import numpy as np
+from functools import cached_property
 from pyjacket.core.slices import slice_length
 
 
+_FULL_SLICE = slice(None, None, None)
+_END = object()  # marks the end of prefetched frames
+
+def _is_full(s) -> bool:
+    """Whether s is the [:] slice, checked without slice rich comparison"""
+    return s is _FULL_SLICE or (
+        type(s) is slice and s.start is None and s.stop is None and s.step is None)
+
+
 class Metadata:
 
     def __init__(self, file_path):
@@ -33,14 +45,14 @@ class Metadata:
         raise NotImplementedError() 
 
     def __repr__(self):
-        return f"Metadata({dir(self)})"
+        return f"Metadata({self.file_path!r})"
 
 
 class ImageHandle:
     """Access image data lazily with numpy-like slicing"""
 
-    slices: list[slice]
     operator: object
+    prefetch: int = 0  # frames read ahead in a thread; only enable if get() is thread-safe
 
     def __init__(self, file_path, unzip=1):
         print(f'Reading {unzip = }')
@@ -49,7 +61,7 @@ class ImageHandle:
         self.data = self.open()
         # self.meta = self.get_meta()
         self.max_shape = self.get_max_shape()
-        self.slices = [slice(None, None, None)] * len(self.max_shape)
+        self.slices = [_FULL_SLICE] * len(self.max_shape)
         self.operator = None
 
         self.dtype = self.get(0).dtype
@@ -67,53 +79,147 @@ class ImageHandle:
     def get_max_shape(self):
         raise NotImplementedError()
 
+    def _read_slab(self, i: int, spatial_slices: list[slice]) -> np.ndarray:
+        """Read frame i cropped to spatial_slices. Override to avoid reading the full frame"""
+        return self.get(i)[tuple(spatial_slices)]
+
+    def read_all(self) -> np.ndarray:
+        """Load all (sliced) image data at once. Override with a bulk read if possible"""
+        out = np.empty(self.shape, dtype=self.dtype)
+        for i, frame in enumerate(self):
+            out[i] = frame
+        return out
 
     # ============================= #
     @property
+    def slices(self) -> list[slice]:
+        return self._slices
+
+    @slices.setter
+    def slices(self, slices: list[slice]):
+        # Assign a new list (don't mutate in place) so the cached shape is reset
+        self._slices = slices
+        self.__dict__.pop('shape', None)
+
+    @cached_property
     def ndim(self):
-        return len(self.shape)
+        return len(self.max_shape)
 
-    @property
+    @cached_property
     def shape(self):
         """The shape of a cropped variant of this data"""
         return tuple(slice_length(s, n) for s, n in zip(self.slices, self.max_shape))
 
     def copy(self):
-        return type(self)(self.file_path, unzip=self.unzip)
+        """Shallow copy that shares the open file instead of reopening it"""
+        obj = type(self).__new__(type(self))
+        obj.__dict__ = self.__dict__.copy()
+        obj.slices = list(self.slices)
+        obj._parent = self  # keeps the file open while the copy is alive
+        return obj
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._owns_file():
+            self.close()
 
     def __del__(self):
         """Ensure all files are closed when the object is deleted."""
-        self.close()
+        if self._owns_file():
+            self.close()
+
+    def _owns_file(self) -> bool:
+        """Copies share their parent's file and must not close it"""
+        return self.__dict__.get('_parent') is None
 
     def __getitem__(self, val):
-        if not all(x == slice(None, None, None) for x in self.slices):
+        if not all(_is_full(x) for x in self.slices):
             raise NotImplementedError(f'slices of slices are not supported!')
 
         if isinstance(val, int):
             return self.get(val)
 
         elif isinstance(val, slice):
+            if _is_full(val):
+                return self.copy()  # not self: closing the result must not close this handle
             obj = self.copy()
-            obj.slices[0] = val
+            obj.slices = [val, *self.slices[1:]]
             return obj
 
         elif isinstance(val, tuple):
+            if all(_is_full(s) for s in val):
+                return self.copy()
             obj = self.copy()
-            obj.slices = self.slices[:]
+            slices = list(self.slices)
             for i, s in enumerate(val):
-                if s != slice(None, None, None):
-                    obj.slices[i] = s
+                if not _is_full(s):
+                    slices[i] = s
+            obj.slices = slices
             return obj
 
     def __iter__(self):
-        """Return image data frame by frame"""
+        """Return image data frame by frame
+
+        If prefetch is set, frames are read in a background thread, so reading
+        the next frame overlaps with processing the current one. Handles with
+        an operator are always iterated serially.
+        """
+        if not self.prefetch or self.operator:
+            yield from self._iter_frames()
+            return
+
+        buffer = queue.Queue(maxsize=self.prefetch)
+        done = threading.Event()  # set when the consumer stops early
+        errors = []
+
+        def put(item):
+            while not done.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def produce():
+            try:
+                for frame in self._iter_frames():
+                    if not put(frame):
+                        return
+            except Exception as e:
+                errors.append(e)
+            put(_END)
+
+        thread = threading.Thread(target=produce, daemon=True)
+        thread.start()
+        try:
+            while True:
+                frame = buffer.get()
+                if frame is _END:
+                    break
+                yield frame
+            if errors:
+                raise errors[0]
+        finally:
+            done.set()
+            thread.join()
+
+    def _iter_frames(self):
         start, stop, step = self.slices[0].indices(self.max_shape[0])
+        spatial_slices = self.slices[1:]
+        spatial_idx = tuple(spatial_slices)
+        crop = not all(_is_full(s) for s in spatial_slices)
         for i in range(start, stop, step):
             if self.operator:
                 frame = self.operator(self, i)
+                if crop:
+                    frame = frame[spatial_idx]
+            elif crop:
+                frame = self._read_slab(i, spatial_slices)
             else:
                 frame = self.get(i)
-            frame = frame[tuple(self.slices[1:])]
             yield frame
 
     def __len__(self):